@@ -0,0 +1,66 @@
+"""Compare the throughput of the predefined session backends.
+
+Run with `poetry run python benchmarks/backends.py`. Redis and Memcache are
+measured against their in-process test doubles (fakeredis and pymemcache's
+MockMemcacheClient), so their numbers are an upper bound that leaves out the
+network round trip.
+"""
+import asyncio
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import fakeredis
+from pymemcache.test.utils import MockMemcacheClient
+
+from starlette_session.backends import (MemcacheSessionBackend,
+                                        RedisSessionBackend,
+                                        SQLiteSessionBackend)
+from starlette_session.interfaces import ISessionBackend
+
+SESSIONS = 2000
+CONCURRENCY = 50
+SESSION = {"user_id": 42, "roles": ["admin", "user"], "csrf": "x" * 32}
+
+
+async def _run(operation: Callable, keys: List[str]) -> float:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def bounded(key: str) -> None:
+        async with semaphore:
+            await operation(key)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bounded(key) for key in keys))
+    return time.perf_counter() - start
+
+
+async def bench(backend: ISessionBackend) -> Dict[str, float]:
+    keys = [f"session-{i}" for i in range(SESSIONS)]
+    return {
+        "set": SESSIONS / await _run(lambda k: backend.set(k, SESSION, 3600), keys),
+        "get": SESSIONS / await _run(backend.get, keys),
+        "delete": SESSIONS / await _run(backend.delete, keys),
+    }
+
+
+async def main() -> None:
+    directory = tempfile.mkdtemp()
+    backends = {
+        "redis (fakeredis)": RedisSessionBackend(fakeredis.FakeStrictRedis()),
+        "memcache (mock)": MemcacheSessionBackend(MockMemcacheClient()),
+        "sqlite (wal)": SQLiteSessionBackend(os.path.join(directory, "sessions.db")),
+    }
+
+    print(f"{'backend':<20}{'set/s':>12}{'get/s':>12}{'delete/s':>12}")
+    for name, backend in backends.items():
+        result = await bench(backend)
+        print(
+            f"{name:<20}{result['set']:>12.0f}"
+            f"{result['get']:>12.0f}{result['delete']:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
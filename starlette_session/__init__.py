@@ -1,5 +1,8 @@
+import asyncio
 import json
+import time
 from base64 import b64decode, b64encode
+from copy import deepcopy
 from typing import Any, Optional
 from uuid import uuid4
 
@@ -12,7 +15,8 @@ from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from starlette_session.backends import (AioMemcacheSessionBackend,
                                         AioRedisSessionBackend, BackendType,
                                         MemcacheSessionBackend,
-                                        RedisSessionBackend)
+                                        RedisSessionBackend,
+                                        SQLiteSessionBackend)
 from starlette_session.interfaces import ISessionBackend
 
 
@@ -33,6 +37,7 @@ class SessionMiddleware:
         backend_type: Optional[BackendType] = None,
         backend_client: Optional[Any] = None,
         custom_session_backend: Optional[ISessionBackend] = None,
+        websocket_checkpoint_interval: Optional[float] = 60.0,
     ) -> None:
         """ Session Middleware
 
@@ -49,6 +54,10 @@ class SessionMiddleware:
                 backend_client: The client to use in the predefined backend. See examples for examples
                     with predefined backends (Default to None).
                 custom_session_backend: A custom backend that implement ISessionBackend.
+                websocket_checkpoint_interval: Number of seconds between two saves
+                    of a modified session during a websocket connection. The session
+                    is always saved when the websocket closes. If None, it is only
+                    saved on close (Default to 60 seconds).
 
             Raises:
                 UnknownPredefinedBackend: The predefined backend type is unkown.
@@ -65,6 +74,7 @@ class SessionMiddleware:
         self.cookie_name = cookie_name
         self.max_age = max_age
         self.domain = domain
+        self.websocket_checkpoint_interval = websocket_checkpoint_interval
 
         self._cookie_session_id_field = "_cssid"
 
@@ -99,6 +109,14 @@ class SessionMiddleware:
         else:
             scope["session"] = {}
 
+        if (
+            scope["type"] == "websocket"
+            and self.session_backend
+            and self.backend_type != BackendType.cookie
+        ):
+            await self._call_websocket(scope, receive, send, self.session_backend)
+            return
+
         async def send_wrapper(message: Message, **kwargs) -> None:
             if message["type"] == "http.response.start":
 
@@ -117,8 +135,7 @@ class SessionMiddleware:
                         )
                         cookie_data = {self._cookie_session_id_field: session_key}
 
-                    data = b64encode(json.dumps(cookie_data).encode("utf-8"))
-                    data = self.signer.sign(data)
+                    data = self._sign(cookie_data)
 
                     headers = MutableHeaders(scope=message)
                     header_value = self._construct_cookie(clear=False, data=data)
@@ -137,6 +154,103 @@ class SessionMiddleware:
 
         await self.app(scope, receive, send_wrapper)
 
+    async def _call_websocket(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        session_backend: ISessionBackend,
+    ) -> None:
+        """Run a websocket connection, checkpointing its session to the backend.
+
+        Mutations are coalesced: a timer saves the modified session every
+        `websocket_checkpoint_interval` seconds, and it is saved once more when the
+        websocket closes. An unchanged session is only rewritten, to refresh its
+        expiry, once half of `max_age` has passed since it was last written. Only
+        sessions the client holds a cookie for are saved.
+        """
+        session_key = scope.pop("__session_key", None)
+        tracked = session_key is not None
+        if session_key is None:
+            session_key = str(uuid4())
+        saved_session = deepcopy(scope["session"])
+        persisted = bool(saved_session)
+        last_write = time.monotonic()
+        save_lock = asyncio.Lock()
+        checkpoints: Optional["asyncio.Task[None]"] = None
+        closed = False
+
+        async def save(refresh: bool) -> None:
+            nonlocal saved_session, persisted, last_write
+
+            # Without a cookie nobody could ever load the session again.
+            if not tracked:
+                return
+
+            async with save_lock:
+                session = scope["session"]
+                if session == saved_session and not (refresh and session):
+                    return
+
+                if session:
+                    await session_backend.set(session_key, session, self.max_age)
+                    persisted = True
+                elif persisted:
+                    await session_backend.delete(session_key)
+                    persisted = False
+                saved_session = deepcopy(session)
+                last_write = time.monotonic()
+
+        async def checkpoint(interval: float) -> None:
+            while True:
+                await asyncio.sleep(interval)
+                await save(refresh=time.monotonic() - last_write >= self.max_age / 2)
+
+        async def close() -> None:
+            nonlocal closed
+            if closed:
+                return
+            closed = True
+            if checkpoints is not None:
+                checkpoints.cancel()
+            await save(refresh=True)
+
+        async def receive_wrapper() -> Message:
+            message = await receive()
+            if message["type"] == "websocket.disconnect":
+                await close()
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal tracked, checkpoints
+            if message["type"] == "websocket.accept":
+                if scope["session"]:
+                    tracked = True
+                    await save(refresh=False)
+                    message["headers"] = list(message.get("headers", []))
+                    data = self._sign({self._cookie_session_id_field: session_key})
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Set-Cookie", self._construct_cookie(data=data))
+                interval = self.websocket_checkpoint_interval
+                if tracked and interval is not None:
+                    checkpoints = asyncio.ensure_future(checkpoint(interval))
+            elif message["type"] == "websocket.close":
+                await close()
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            if checkpoints is not None:
+                checkpoints.cancel()
+        # Keep changes made after the socket closed. Like http, nothing is saved
+        # when the app raises.
+        await save(refresh=False)
+
+    def _sign(self, cookie_data: dict) -> bytes:
+        data = b64encode(json.dumps(cookie_data).encode("utf-8"))
+        return self.signer.sign(data)
+
     def _get_predefined_session_backend(
         self, backend_db_client
     ) -> Optional[ISessionBackend]:
@@ -150,6 +264,8 @@ class SessionMiddleware:
             return MemcacheSessionBackend(backend_db_client)
         elif self.backend_type == BackendType.aioMemcache:
             return AioMemcacheSessionBackend(backend_db_client)
+        elif self.backend_type == BackendType.sqlite:
+            return SQLiteSessionBackend(backend_db_client)
         else:
             raise UnknownPredefinedBackend()
 
@@ -1,8 +1,12 @@
 import json
+import sqlite3
+import threading
+import time
 from enum import Enum
 from functools import partial
 from pickle import HIGHEST_PROTOCOL, dumps, loads
-from typing import Any, Optional
+from queue import Empty, Queue
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 try:
     from redis import Redis
@@ -26,12 +30,16 @@ try:
 except ImportError:
     AioMemcache = None  # pragma: no cover
 
+from starlette.concurrency import run_in_threadpool
 
 from starlette_session.interfaces import ISessionBackend
 
 _dumps = partial(dumps, protocol=HIGHEST_PROTOCOL)
 _loads = partial(loads)
 
+# A pending SQLite write: the pickled session and its expiry, or None to delete.
+_Row = Optional[Tuple[bytes, Optional[float]]]
+
 
 class MemcacheJSONSerde(object):
     def serialize(self, key, value):
@@ -55,6 +63,7 @@ class BackendType(Enum):
     cookie = "cookie"
     memcache = "memcache"
     aioMemcache = "aioMemcache"
+    sqlite = "sqlite"
 
 
 class RedisSessionBackend(ISessionBackend):
@@ -125,3 +134,207 @@ class AioMemcacheSessionBackend(ISessionBackend):
 
     async def delete(self, key: str, **kwargs: dict) -> Any:  # pragma: no cover
         return await self.memcache.delete(key.encode(), **kwargs)
+
+
+class SQLiteSessionBackend(ISessionBackend):
+    """Durable session backend stored in a SQLite database in WAL mode.
+
+    Every blocking call runs in the threadpool. Concurrent writes are group
+    committed: whichever thread gets the connection first commits every pending
+    write in a single transaction. Expired rows are deleted as part of a write
+    transaction, at most `sweep_batch_size` rows at a time and no more than once
+    every `sweep_interval` seconds while there is nothing left to sweep.
+
+    Reads borrow one of at most `max_readers` connections and never wait for the
+    writer, except for in-memory databases which only have the one connection.
+
+    When passing your own connection, open it with `check_same_thread=False`.
+    It is left open by `close`.
+    """
+
+    table = "starlette_session"
+
+    def __init__(
+        self,
+        sqlite: Union[str, sqlite3.Connection],
+        sweep_interval: float = 60.0,
+        sweep_batch_size: int = 500,
+        busy_timeout: int = 5000,
+        max_readers: int = 40,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._owns_connection = not isinstance(sqlite, sqlite3.Connection)
+        if isinstance(sqlite, sqlite3.Connection):
+            self.sqlite = sqlite
+        else:
+            self.sqlite = sqlite3.connect(
+                sqlite, check_same_thread=False, isolation_level=None
+            )
+        self.sweep_interval = sweep_interval
+        self.sweep_batch_size = sweep_batch_size
+        self.busy_timeout = busy_timeout
+        self.max_readers = max_readers
+        self.clock = clock
+
+        # Serialises every use of the write connection.
+        self._lock = threading.Lock()
+        # Every reader opened so far, and the ones not borrowed right now.
+        self._readers: List[sqlite3.Connection] = []
+        self._idle_readers: "Queue[sqlite3.Connection]" = Queue()
+        self._opened_readers = 0
+        # Guards the pending writes, the tickets below and the readers.
+        self._pending_lock = threading.Lock()
+        # Each pending write is tagged with the ticket of the call that queued it.
+        self._pending: Dict[str, Tuple[int, _Row]] = {}
+        self._enqueued = 0
+        self._committed = 0
+        self._last_sweep = 0.0
+
+        with self._lock:
+            self.sqlite.execute(f"PRAGMA busy_timeout = {int(busy_timeout)}")
+            self.sqlite.execute("PRAGMA journal_mode = WAL")
+            self.sqlite.execute("PRAGMA synchronous = NORMAL")
+            self.sqlite.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "id TEXT PRIMARY KEY NOT NULL, "
+                "data BLOB NOT NULL, "
+                "expires_at REAL"
+                ") WITHOUT ROWID"
+            )
+            self.sqlite.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{self.table}_expires_at "
+                f"ON {self.table} (expires_at)"
+            )
+            if self.sqlite.in_transaction:  # pragma: no cover
+                self.sqlite.commit()
+            # Empty for in-memory databases, which cannot be shared.
+            self._database = self.sqlite.execute("PRAGMA database_list").fetchone()[2]
+
+    async def get(self, key: str, **kwargs: dict) -> Optional[dict]:
+        value = await run_in_threadpool(self._read, key)
+        return _loads(value) if value else None
+
+    async def set(
+        self, key: str, value: dict, exp: Optional[int] = None, **kwargs: dict
+    ) -> Optional[str]:
+        expires_at = self.clock() + exp if exp else None
+        await run_in_threadpool(self._write, key, (_dumps(value), expires_at))
+        return None
+
+    async def delete(self, key: str, **kwargs: dict) -> Any:
+        await run_in_threadpool(self._write, key, None)
+        return None
+
+    def close(self) -> None:
+        with self._lock, self._pending_lock:
+            for reader in self._readers:
+                reader.close()
+            self._readers = []
+            self._idle_readers = Queue()
+            self._opened_readers = 0
+            if self._owns_connection:
+                self.sqlite.close()
+
+    def _borrow_reader(self) -> sqlite3.Connection:
+        try:
+            return self._idle_readers.get_nowait()
+        except Empty:
+            pass
+
+        with self._pending_lock:
+            can_open = self._opened_readers < self.max_readers
+            if can_open:
+                self._opened_readers += 1
+        if not can_open:
+            return self._idle_readers.get()
+
+        reader = sqlite3.connect(
+            self._database, check_same_thread=False, isolation_level=None
+        )
+        reader.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+        with self._pending_lock:
+            self._readers.append(reader)
+        return reader
+
+    def _read(self, key: str) -> Optional[bytes]:
+        query = f"SELECT data, expires_at FROM {self.table} WHERE id = ?"
+        if self._database:
+            reader = self._borrow_reader()
+            try:
+                result = reader.execute(query, (key,)).fetchone()
+            finally:
+                self._idle_readers.put(reader)
+        else:
+            with self._lock:
+                result = self.sqlite.execute(query, (key,)).fetchone()
+
+        if result is None or self._expired(result[1]):
+            return None
+        return result[0]
+
+    def _write(self, key: str, row: _Row) -> None:
+        with self._pending_lock:
+            self._enqueued += 1
+            ticket = self._enqueued
+            self._pending[key] = (ticket, row)
+
+        with self._lock:
+            if self._committed >= ticket:
+                # Another thread committed our write along with its own.
+                return
+
+            with self._pending_lock:
+                batch, self._pending = self._pending, {}
+                last_ticket = self._enqueued
+
+            upserts = [(k, v[0], v[1]) for k, (_, v) in batch.items() if v is not None]
+            deletes = [(k,) for k, (_, v) in batch.items() if v is None]
+
+            try:
+                self.sqlite.execute("BEGIN IMMEDIATE")
+                if upserts:
+                    self.sqlite.executemany(
+                        f"INSERT OR REPLACE INTO {self.table} (id, data, expires_at) "
+                        "VALUES (?, ?, ?)",
+                        upserts,
+                    )
+                if deletes:
+                    self.sqlite.executemany(
+                        f"DELETE FROM {self.table} WHERE id = ?", deletes
+                    )
+                self._sweep()
+                self.sqlite.execute("COMMIT")
+            except BaseException:
+                if self.sqlite.in_transaction:
+                    self.sqlite.execute("ROLLBACK")
+                # Our caller is told the write failed, so it must not land later.
+                # The other writes in the batch are retried by their own threads.
+                if key in batch and batch[key][0] == ticket:
+                    del batch[key]
+                with self._pending_lock:
+                    # Keep newer writes queued after the failed batch.
+                    batch.update(self._pending)
+                    self._pending = batch
+                raise
+
+            self._committed = last_ticket
+
+    def _sweep(self) -> int:
+        now = self.clock()
+        if now - self._last_sweep < self.sweep_interval:
+            return 0
+
+        deleted = self.sqlite.execute(
+            f"DELETE FROM {self.table} WHERE id IN ("
+            f"SELECT id FROM {self.table} WHERE expires_at <= ? LIMIT ?)",
+            (now, self.sweep_batch_size),
+        ).rowcount
+
+        # A full batch means more rows are probably expired: leave the clock
+        # alone so the next write carries on sweeping.
+        if deleted < self.sweep_batch_size:
+            self._last_sweep = now
+        return deleted
+
+    def _expired(self, expires_at: Optional[float]) -> bool:
+        return expires_at is not None and expires_at <= self.clock()
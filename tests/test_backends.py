@@ -1,4 +1,8 @@
+import asyncio
 import re
+import sqlite3
+import threading
+import time
 
 import fakeredis
 import pytest
@@ -7,9 +11,11 @@ from starlette.applications import Starlette
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 from starlette.testclient import TestClient
+from starlette.websockets import WebSocket
 
 from starlette_session import SessionMiddleware
-from starlette_session.backends import BackendType, MemcacheJSONSerde
+from starlette_session.backends import (BackendType, MemcacheJSONSerde,
+                                        SQLiteSessionBackend)
 
 
 def view_session(request: Request) -> JSONResponse:
@@ -27,12 +33,24 @@ async def clear_session(request: Request) -> JSONResponse:
     return JSONResponse({"session": request.session})
 
 
+async def update_session_websocket(websocket: WebSocket) -> None:
+    await websocket.accept()
+    while True:
+        data = await websocket.receive_json()
+        if data is None:
+            break
+        websocket.session.update(data)
+        await websocket.send_json({"session": websocket.session})
+    await websocket.close()
+
+
 @pytest.fixture
 def app():
     app = Starlette()
     app.add_route("/view_session", view_session)
     app.add_route("/update_session", update_session, methods=["POST"])
     app.add_route("/clear_session", clear_session, methods=["POST"])
+    app.add_websocket_route("/update_session_websocket", update_session_websocket)
     return app
 
 
@@ -46,6 +64,11 @@ def memcache():
     return MockMemcacheClient()
 
 
+@pytest.fixture
+def sqlite(tmp_path) -> str:
+    return str(tmp_path / "sessions.db")
+
+
 def test_MemcacheJSONSerde():
     serde = MemcacheJSONSerde()
 
@@ -140,3 +163,323 @@ def test_with_memcache_backend(mocker, app, memcache):
     response = client.post("/clear_session")
     assert response.json() == {"session": {}}
     spy_redis_delete.assert_called_once()
+
+
+def test_with_sqlite_backend(mocker, app, sqlite):
+
+    app.add_middleware(
+        SessionMiddleware,
+        secret_key="secret",
+        cookie_name="cookie",
+        backend_type=BackendType.sqlite,
+        backend_client=sqlite,
+    )
+    client = TestClient(app)
+
+    spy_sqlite_set = mocker.spy(SQLiteSessionBackend, "set")
+    spy_sqlite_get = mocker.spy(SQLiteSessionBackend, "get")
+    spy_sqlite_delete = mocker.spy(SQLiteSessionBackend, "delete")
+
+    response = client.get("/view_session")
+    assert response.json() == {"session": {}}
+
+    response = client.post("/update_session", json={"data": "something"})
+    assert response.json() == {"session": {"data": "something"}}
+    spy_sqlite_set.assert_called_once()
+
+    response = client.get("/view_session")
+    assert response.json() == {"session": {"data": "something"}}
+    spy_sqlite_get.assert_called_once()
+
+    response = client.post("/clear_session")
+    assert response.json() == {"session": {}}
+    spy_sqlite_delete.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_persists_across_connections(sqlite):
+    backend = SQLiteSessionBackend(sqlite)
+    await backend.set("key", {"data": "something"}, 60)
+
+    other = SQLiteSessionBackend(sqlite)
+    assert await other.get("key") == {"data": "something"}
+    assert backend.sqlite.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    await backend.delete("key")
+    assert await other.get("key") is None
+
+    other.close()
+    backend.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_group_commits_concurrent_writes(mocker, sqlite):
+    backend = SQLiteSessionBackend(sqlite)
+    sweep = backend._sweep
+
+    def slow_sweep() -> int:
+        # Keep the first transaction open so the other writes queue up.
+        time.sleep(0.2)
+        return sweep()
+
+    spy_sweep = mocker.patch.object(backend, "_sweep", side_effect=slow_sweep)
+
+    await asyncio.gather(*(backend.set(f"key{i}", {"data": i}, 60) for i in range(20)))
+
+    # One call per transaction.
+    assert spy_sweep.call_count < 20
+    for i in range(20):
+        assert await backend.get(f"key{i}") == {"data": i}
+
+    backend.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_failed_write_is_not_kept(sqlite):
+    backend = SQLiteSessionBackend(sqlite)
+    backend.sqlite.execute(
+        f"CREATE TRIGGER fail BEFORE INSERT ON {backend.table} "
+        "WHEN NEW.id = 'failing' BEGIN SELECT RAISE(ABORT, 'failed'); END"
+    )
+
+    with pytest.raises(sqlite3.IntegrityError):
+        await backend.set("failing", {"data": "something"}, 60)
+    assert await backend.get("failing") is None
+
+    await backend.set("key", {"data": "something"}, 60)
+    assert await backend.get("key") == {"data": "something"}
+    assert await backend.get("failing") is None
+
+    backend.close()
+
+
+def test_sqlite_backend_reader_connections_are_bounded(sqlite):
+    backend = SQLiteSessionBackend(sqlite, max_readers=4)
+    asyncio.run(backend.set("key", {"data": "something"}, 60))
+
+    results = []
+
+    def read() -> None:
+        results.append(backend._read("key"))
+
+    for _ in range(10):
+        threads = [threading.Thread(target=read) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(results) == 200 and all(results)
+    assert len(backend._readers) <= 4
+
+    backend.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_sweeps_expired_sessions_in_batches(sqlite):
+    now = time.time()
+    backend = SQLiteSessionBackend(
+        sqlite, sweep_interval=3600, sweep_batch_size=2, clock=lambda: now
+    )
+    for i in range(5):
+        await backend.set(f"expired{i}", {"data": i}, 60)
+
+    now += 7200
+    assert await backend.get("expired0") is None
+
+    def remaining() -> int:
+        return backend.sqlite.execute(
+            f"SELECT COUNT(*) FROM {backend.table}"
+        ).fetchone()[0]
+
+    # Each write removes at most one batch, and keeps sweeping while
+    # batches come back full.
+    await backend.set("fresh0", {}, 60)
+    assert remaining() == 3 + 1
+    await backend.set("fresh1", {}, 60)
+    assert remaining() == 1 + 2
+    await backend.set("fresh2", {}, 60)
+    assert remaining() == 0 + 3
+
+    # The last batch was not full, so the next sweep waits for the interval.
+    await backend.set("expired5", {}, 1)
+    assert remaining() == 4
+
+    backend.close()
+
+
+def test_websocket_session_is_saved_once_on_close(mocker, app, redis):
+
+    app.add_middleware(
+        SessionMiddleware,
+        secret_key="secret",
+        cookie_name="cookie",
+        backend_type=BackendType.redis,
+        backend_client=redis,
+    )
+    client = TestClient(app)
+
+    client.post("/update_session", json={"data": "something"})
+
+    spy_redis_set = mocker.spy(redis, "set")
+
+    with client.websocket_connect("/update_session_websocket") as websocket:
+        for i in range(10):
+            websocket.send_json({"counter": i})
+            assert websocket.receive_json()["session"]["counter"] == i
+        spy_redis_set.assert_not_called()
+        websocket.send_json(None)
+
+    spy_redis_set.assert_called_once()
+
+    response = client.get("/view_session")
+    assert response.json() == {"session": {"data": "something", "counter": 9}}
+
+
+def test_websocket_session_is_checkpointed_while_idle(app, redis):
+
+    app.add_middleware(
+        SessionMiddleware,
+        secret_key="secret",
+        cookie_name="cookie",
+        backend_type=BackendType.redis,
+        backend_client=redis,
+        websocket_checkpoint_interval=0.05,
+    )
+    client = TestClient(app)
+
+    client.post("/update_session", json={"data": "something"})
+
+    with client.websocket_connect("/update_session_websocket") as websocket:
+        websocket.send_json({"counter": 1})
+        websocket.receive_json()
+
+        # The app now waits in receive() while the client sits idle.
+        time.sleep(0.3)
+        response = client.get("/view_session")
+        assert response.json()["session"]["counter"] == 1
+
+        websocket.send_json(None)
+
+
+def test_websocket_unchanged_session_is_not_rewritten(mocker, app, redis):
+
+    app.add_middleware(
+        SessionMiddleware,
+        secret_key="secret",
+        cookie_name="cookie",
+        backend_type=BackendType.redis,
+        backend_client=redis,
+        websocket_checkpoint_interval=0.05,
+    )
+    client = TestClient(app)
+
+    client.post("/update_session", json={"data": "something"})
+
+    spy_redis_set = mocker.spy(redis, "set")
+
+    with client.websocket_connect("/update_session_websocket") as websocket:
+        time.sleep(0.3)
+        spy_redis_set.assert_not_called()
+        websocket.send_json(None)
+
+
+def test_websocket_checkpoint_refreshes_expiry(app, redis):
+
+    app.add_middleware(
+        SessionMiddleware,
+        secret_key="secret",
+        cookie_name="cookie",
+        max_age=2,
+        backend_type=BackendType.redis,
+        backend_client=redis,
+        websocket_checkpoint_interval=0.05,
+    )
+    client = TestClient(app)
+
+    client.post("/update_session", json={"data": "something"})
+    [session_key] = redis.keys()
+
+    with client.websocket_connect("/update_session_websocket") as websocket:
+        # Past the original expiry: only the refresh at max_age / 2 keeps it.
+        time.sleep(2.5)
+        assert redis.exists(session_key)
+
+        websocket.send_json(None)
+
+
+def test_websocket_session_created_after_accept_is_not_saved(app, redis):
+
+    async def late_session_websocket(websocket: WebSocket) -> None:
+        await websocket.accept()
+        websocket.session["data"] = "something"
+        await websocket.send_json({"session": websocket.session})
+        await websocket.close()
+
+    app.add_websocket_route("/late_session_websocket", late_session_websocket)
+    app.add_middleware(
+        SessionMiddleware,
+        secret_key="secret",
+        cookie_name="cookie",
+        backend_type=BackendType.redis,
+        backend_client=redis,
+        websocket_checkpoint_interval=0.05,
+    )
+    client = TestClient(app)
+
+    with client.websocket_connect("/late_session_websocket") as websocket:
+        assert websocket.extra_headers == []
+        websocket.receive_json()
+
+    assert redis.keys() == []
+
+
+def test_websocket_new_session_sets_cookie_on_accept(app, redis):
+
+    async def new_session_websocket(websocket: WebSocket) -> None:
+        websocket.session["data"] = "something"
+        await websocket.accept()
+        await websocket.close()
+
+    app.add_websocket_route("/new_session_websocket", new_session_websocket)
+    app.add_middleware(
+        SessionMiddleware,
+        secret_key="secret",
+        cookie_name="cookie",
+        backend_type=BackendType.redis,
+        backend_client=redis,
+    )
+    client = TestClient(app)
+
+    with client.websocket_connect("/new_session_websocket") as websocket:
+        assert "cookie" in websocket.extra_headers[0][1].decode()
+
+    assert len(redis.keys()) == 1
+
+
+def test_websocket_session_is_not_saved_when_app_fails(mocker, app, redis):
+
+    async def failing_websocket(websocket: WebSocket) -> None:
+        await websocket.accept()
+        websocket.session["counter"] = 1
+        raise RuntimeError()
+
+    app.add_websocket_route("/failing_websocket", failing_websocket)
+    app.add_middleware(
+        SessionMiddleware,
+        secret_key="secret",
+        cookie_name="cookie",
+        backend_type=BackendType.redis,
+        backend_client=redis,
+    )
+    client = TestClient(app)
+
+    client.post("/update_session", json={"data": "something"})
+
+    spy_redis_set = mocker.spy(redis, "set")
+
+    with pytest.raises(RuntimeError):
+        with client.websocket_connect("/failing_websocket"):
+            pass
+
+    spy_redis_set.assert_not_called()